@@ -0,0 +1,90 @@
+# imports
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from datetime import date
+
+def prune_cache(cache_dir):
+    """
+    Deletes every file in cache_dir that was written before today;
+    today's date is part of every cache key, so those can never be read again
+    """
+    today = date.today()
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            if date.fromtimestamp(os.path.getmtime(path)) < today:
+                os.remove(path)
+        except OSError:
+            # already removed by another process or thread
+            pass
+
+def cached(ttl_seconds = 86400, cache_dir = '.cache', cache_if = None):
+    """
+    Decorator that pickles whatever the wrapped function returns
+    into cache_dir, keyed by the function, its arguments and today's date
+
+    Later calls with the same arguments on the same day load the
+    saved result instead of calling the function again, as long as
+    the file is younger than ttl_seconds (one day by default)
+
+    cache_if can be given a function that takes the result and returns
+    whether it is fit to be saved; by default only empty results
+    (failed downloads) are left out of the cache
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # hash the call so that it can be used as a file name;
+            # the date is part of the key so nothing fetched on an
+            # earlier day is ever reused
+            key = repr((func.__module__, func.__qualname__,
+                        args, sorted(kwargs.items()), date.today()))
+            name = hashlib.md5(key.encode()).hexdigest()
+            path = os.path.join(cache_dir, f'{name}.pkl')
+
+            # reuse the saved result if it is recent enough
+            try:
+                if time.time() - os.path.getmtime(path) < ttl_seconds:
+                    with open(path,'rb') as f:
+                        return pickle.load(f)
+            except Exception:
+                # missing, unreadable or written by an incompatible
+                # version of a library; call the function again instead
+                pass
+
+            result = func(*args, **kwargs)
+
+            # don't hold on to failed downloads, so the next call retries
+            if cache_if is None:
+                keep = not getattr(result, 'empty', False)
+            else:
+                keep = cache_if(result)
+            if not keep:
+                return result
+
+            # clear out entries from earlier days while we're here
+            os.makedirs(cache_dir, exist_ok = True)
+            prune_cache(cache_dir)
+
+            # write to a uniquely named temporary file first so that
+            # concurrent writers (threads or processes) don't clash and
+            # readers never see a half-written cache entry
+            fd, tmp_path = tempfile.mkstemp(dir = cache_dir, suffix = '.tmp')
+            try:
+                with os.fdopen(fd,'wb') as f:
+                    pickle.dump(result,f)
+                os.replace(tmp_path,path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            return result
+        return wrapper
+    return decorator
@@ -2,37 +2,138 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+import bottleneck as bn
 import zipfile
+import functools
+import os
 import pickle
-from sklearn.preprocessing import StandardScaler
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import repeat
 
-def get_sp500_tickers():
+from cache import cached
+
+def save_tickers(path,tickers):
+    """
+    Pickles a list of tickers along with the time it was scraped
+    """
+    with open(path,'wb') as f:
+        pickle.dump((time.time(),tickers),f)
+
+def load_recent_tickers(path,max_age_days):
+    """
+    Loads a list of tickers saved by save_tickers if it was
+    scraped less than max_age_days ago; otherwise returns None
+    """
+    try:
+        with open(path,'rb') as f:
+            scraped, tickers = pickle.load(f)
+        if time.time() - scraped < max_age_days*86400:
+            return tickers
+    except Exception:
+        # missing, unreadable or written by an incompatible
+        # version of pandas; scrape the tickers again instead
+        pass
+    return None
+
+def get_sp500_tickers(max_age_days = 30):
     """
     Returns a data frame of the most recent
     S&P 500 tickers from the Wikipedia page
     on the S&P 500 Index
 
-    Also saves a pickle file of the tickers for future use
+    Also saves a pickle file of the tickers for future use,
+    which is reused instead of the Wikipedia page
+    until it is max_age_days old
     """
+    tickers = load_recent_tickers('sp500_tickers.pkl',max_age_days)
+    if tickers is not None:
+        return tickers
+
     tickers = pd.read_html(
     'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies')[0]['Symbol']
 
-    with open('sp500_tickers','wb') as f:
-        pickle.dump(tickers,f)
+    save_tickers('sp500_tickers.pkl',tickers)
     return tickers
 
-def get_nasdaq100_tickers():
+def get_nasdaq100_tickers(max_age_days = 30):
     """
     Returns a data frame of the most recent
     NASDAQ100 tickers from the official NASDAQ website
 
-    Also saves a pickle file of the tickers for future use
+    Also saves a pickle file of the tickers for future use,
+    which is reused instead of the website
+    until it is max_age_days old
     """
+    tickers = load_recent_tickers('nasdaq_tickers.pkl',max_age_days)
+    if tickers is not None:
+        return tickers
+
     tickers = pd.read_html('https://en.wikipedia.org/wiki/Nasdaq-100')[3]['Ticker']
-    with open('nasdaq_tickers','wb') as f:
-        pickle.dump(tickers,f)  
+    save_tickers('nasdaq_tickers.pkl',tickers)
     return tickers 
 
+def yahoo_symbol(ticker):
+    """
+    yahoo finance doesn't like '.' full stops, and prefers '-' dashes
+    for american equities
+
+    It also upper-cases every symbol, and keys the downloaded
+    data by that, so we do the same
+    """
+    try:
+        if ticker.replace('.','').isalpha():
+            ticker = ticker.replace('.', '-')
+        ticker = ticker.upper()
+    except:
+        pass
+    return ticker
+
+def download_complete(raw):
+    """
+    Checks that yahoo finance returned data for every ticker in a
+    download; a ticker that failed comes back as a block of all NaNs
+    """
+    if raw.empty:
+        return False
+    tickers = raw.columns.get_level_values(0).unique()
+    return all(raw[ticker].notna().to_numpy().any() for ticker in tickers)
+
+@cached(ttl_seconds = 86400,cache_if = download_complete)
+def download_data(tickers,period = '5y',resolution = '1d'):
+    """
+    Downloads the historical financial information of
+    several tickers at once from yahoo finance
+
+    The requests are spread across a pool of threads, and
+    the returned data frame has one top-level column per ticker
+
+    Responses are cached to disk for the rest of the day, since
+    daily bars don't change between runs on the same day; downloads
+    where any ticker failed aren't cached, so they are retried
+
+    Prices and volumes are kept as float32, which is plenty of
+    precision for percentage changes and halves the memory used
+    """
+    tickers = list(dict.fromkeys(tickers)) # drop duplicates, keep order
+    raw = yf.download(tickers = tickers,period = period,interval = resolution,
+                      group_by = 'ticker',auto_adjust = True,
+                      threads = True,progress = False)
+
+    # a single ticker comes back without the ticker column level;
+    # key it the way yahoo finance keys the others
+    if not isinstance(raw.columns,pd.MultiIndex):
+        raw = pd.concat({tickers[0].upper():raw},axis = 1)
+    return raw.astype(np.float32)
+
+# IEEE-754 infinities are single bit patterns (all exponent bits set,
+# zero mantissa), so they can be found by integer comparison;
+# unsigned view type and +inf/-inf patterns for each float width
+INF_BITS = {np.dtype(np.float32):(np.uint32,0x7F800000,0xFF800000),
+            np.dtype(np.float64):(np.uint64,0x7FF0000000000000,0xFFF0000000000000)}
+
 def remove_inf(df):
     """
     Removes negative and positive infinities from our dataframe
@@ -40,18 +141,31 @@ def remove_inf(df):
     they are located in
     """
     # replace any infinite values with respective
-    # max or min value of each column
-    for col in df.columns:
-        # indices where positive infinities are located
-        p_ind = df[df[col]==np.inf].index
-        # indices where negative infinities are located
-        n_ind = df[df[col]==-np.inf].index
-        # replacing the positive and negative infinities
-        if len(p_ind) > 0:
-            df[col].replace(np.inf,max(df[col].drop(p_ind,axis = 0)),inplace=True)
-        if len(n_ind) > 0:
-            df[col].replace(-np.inf,min(df[col].drop(n_ind,axis = 0)),inplace=True)
-    return df
+    # max or min value of each column in a single pass;
+    # infinities are masked out when looking for those bounds
+    vals = df.to_numpy()
+    if vals.dtype not in INF_BITS:
+        vals = vals.astype(np.float64)
+
+    # locate the infinities by comparing the raw bits
+    uint, pos_inf, neg_inf = INF_BITS[vals.dtype]
+    bits = vals.view(uint)
+    pos = bits == uint(pos_inf)
+    neg = bits == uint(neg_inf)
+
+    # nothing to replace, which includes empty frames
+    # (numpy can't take the bounds of a column with no rows)
+    if not (pos.any() or neg.any()):
+        return df
+
+    finite = np.where(pos | neg, np.nan, vals)
+    with warnings.catch_warnings():
+        # all-NaN columns have no bounds, which numpy warns about
+        warnings.simplefilter('ignore', RuntimeWarning)
+        col_max = np.nanmax(finite, axis=0)
+        col_min = np.nanmin(finite, axis=0)
+    vals = np.where(pos, col_max, np.where(neg, col_min, vals))
+    return pd.DataFrame(vals, index=df.index, columns=df.columns)
 
 def create_target(df):
     """
@@ -63,7 +177,9 @@ def create_target(df):
     #df['close'] = df['close'].pct_change()
     #df.dropna(inplace = True) #drop nan
     df['close'] = df['close'].shift(-1)
-    df['target'] = df['close'].apply(lambda x: 1 if x > 0 else 0)
+    # 1 if the next period's return is positive, 0 otherwise
+    # (including the final period, whose next return is unknown)
+    df['target'] = (df['close'] > 0).astype('int8')
     return df
 
 def create_salient_target(df):
@@ -82,24 +198,57 @@ def create_salient_target(df):
 
     return df
 
+def moving_average(arr,window):
+    """
+    Simple moving average of a 1d array, using bottleneck's
+    single-pass C implementation directly on the array
+
+    Like pandas' rolling mean, a window containing
+    any NaNs (or not yet full) gives NaN
+    """
+    arr = np.asarray(arr)
+    dtype = arr.dtype if arr.dtype.kind == 'f' else np.float64
+    # always accumulate in float64, since a float32 running total over
+    # years of prices loses too much precision; return the input's dtype
+    if window > len(arr):
+        # bottleneck rejects windows longer than the array
+        return np.full(arr.shape,np.nan,dtype = dtype)
+    out = bn.move_mean(arr.astype(np.float64),window = window,min_count = window)
+    return out.astype(dtype)
+
 def create_close_MAs(df,MAs = [5,20,60,200]):
     """
     Create moving average columns of 'close'
     data column in our historical price dataset
     """
     df = df.copy()
+    close = df['close'].to_numpy()
     for ma in MAs:
-        df[f'ma{ma}'] = df['close'].rolling(window=ma).mean()
+        df[f'ma{ma}'] = moving_average(close,ma)
     return df
 
+def standardise(arr):
+    """
+    Scales each column of a 2d array to zero mean and unit variance,
+    with the mean and standard deviation computed in one pass over the
+    whole array; like StandardScaler, NaNs are ignored when computing
+    those (and stay NaN), and constant columns are only centred
+    """
+    # work on our own float32 copy, scaling it in place
+    arr = np.array(arr,dtype = np.float32)
+    with warnings.catch_warnings():
+        # all-NaN columns have no mean or std, which numpy warns about
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(arr,axis = 0,dtype = np.float32)
+        std = np.nanstd(arr,axis = 0,dtype = np.float32)
+    std[std == 0] = 1.0
+    arr -= mean
+    arr /= std
+    return arr
+
 def scale_df(df):
     # for normalising values in our indices' dataframe
-    scaler = StandardScaler()
-    cols = list(df.columns)
-    i_ind = df.index
-    df = pd.DataFrame(scaler.fit_transform(df),index = i_ind)
-    df.columns = cols
-    return df
+    return pd.DataFrame(standardise(df),index = df.index,columns = df.columns)
 
 def get_index_data(indices = ["^GSPC","^VIX"],period = '5y',
                    resolution='1d', MAs = [5,20,60,200]):
@@ -112,26 +261,39 @@ def get_index_data(indices = ["^GSPC","^VIX"],period = '5y',
     In this case, we used the following financial indices
     to train our model:
     ['^GSPC','^VIX']
-    """
 
-    main_df = pd.DataFrame()
+    Results are memoised, so asking for the same indices again
+    within a session doesn't repeat the work
+    """
+    # lists can't be hashed, so memoise on tuples; today's date is part
+    # of the key so that a long-running app still picks up new data.
+    # hand back a copy so callers can't modify the memoised data frame
+    return _get_index_data(tuple(indices),period,resolution,tuple(MAs),
+                           date.today()).copy()
+
+@functools.lru_cache(maxsize = 8)
+def _get_index_data(indices,period,resolution,MAs,day):
+    # read in every indices' historical financial information at once
+    raw = download_data(indices,period,resolution)
+
+    frames = [] # each indices' processed data
     for ind in indices:
-        # read in a specific indices' historical financial information
-        df = yf.Ticker(ind).history(period=period,interval = resolution)
+        # pick out a specific indices' historical financial information
+        # (yahoo finance keys it by the upper-cased symbol)
+        df = raw[ind.upper()].dropna(how = 'all')
 
         # drop whichever columns work
-        try:
-          df.drop(['Dividends','Stock Splits','Open','Low','High'],axis = 1,inplace = True)
-        except:
-          df.drop(['Open','Low','High'],axis = 1,inplace = True)
+        df = df.drop(['Dividends','Stock Splits','Open','Low','High'],
+                     axis = 1,errors = 'ignore')
 
         # lowercase the columns and label them
         for col in df.columns:
           df.rename(columns = {col:f'{ind}-{col.lower()}'},inplace = True)
 
         # create moving average columns
+        close = df[f'{ind}-close'].to_numpy()
         for ma in MAs:
-          df[f'{ind}-ma{ma}'] = df[f'{ind}-close'].rolling(window=ma).mean()
+          df[f'{ind}-ma{ma}'] = moving_average(close,ma)
 
         # scale data frame w/ percent change
         # df = scale_df(df)
@@ -144,112 +306,162 @@ def get_index_data(indices = ["^GSPC","^VIX"],period = '5y',
         except:
             pass
 
-        # forward fill any NA values
-        df.fillna(method = 'ffill')
         # remove inf values potentially created
         df = remove_inf(df)
 
-        # add this data to our final df
-        if main_df.empty:
-          main_df = df
-        else:
-          main_df = pd.concat([main_df,df],axis = 1)
+        # add this data to our list of frames
+        frames.append(df)
+
+    # combine everything along the column-axis in one go
+    main_df = pd.concat(frames,axis = 1) if frames else pd.DataFrame()
     return main_df
 
 def scale_df2(df):
     # normalise all columns except for the
     # column containing our closing price
 
-    scaler = StandardScaler()
-    y = df['close']
-    X = df.drop(['close'],axis = 1)
-    cols = list(X.columns)
-    X = pd.DataFrame(scaler.fit_transform(X),index = y.index)
-    df = pd.concat([y,X],axis = 1)
-    df.columns = ['close'] + cols
+    cols = [col for col in df.columns if col != 'close']
+    # scale the features as one array and wrap it in a data frame once,
+    # rather than dropping 'close' and concatenating it back on
+    scaled = pd.DataFrame(standardise(df[cols]),index = df.index,columns = cols)
+    scaled.insert(0,'close',df['close'])
+    return scaled
+
+def process_ticker(df,index_df,MAs = [5,20,60,200]):
+    """
+    Turns a single ticker's historical financial information
+    into rows of our training dataset
+    """
+    # drop columns we won't be using from that dataframe
+    df = df.drop(['Dividends','Stock Splits'],axis = 1,errors = 'ignore')
+
+    # make column names lower cased, because it's easier to type
+    for col in df.columns:
+        df.rename(columns = {col:col.lower()},inplace = True)
+
+    # add a few rolling window columns on our closing price
+    df = create_close_MAs(df,MAs)
+
+    # scale data frame w/ percent change
+    # df = scale_df(df)
+    df = df.pct_change()
+
+    df = remove_inf(df) # remove inf values
+
+    # merge the extra financial info along the column-axis
+    df = pd.concat([df,index_df], axis=1, ignore_index=False)
+
+    # make our target variable
+    df = create_target(df)
+
+    # remove NaNs
+    df.dropna(inplace = True,axis = 0)
     return df
 
+# index data shared by every ticker a worker process handles;
+# set once per worker by _init_worker
+_worker_index_df = None
+
+def _init_worker(index_df):
+    global _worker_index_df
+    _worker_index_df = index_df
+
+def _process_ticker_worker(df,MAs):
+    # tickers that fail to process are skipped
+    try:
+        return process_ticker(df,_worker_index_df,MAs)
+    except:
+        return None
+
 def compile_data(tickers,indices = ["^GSPC","^VIX"],
                  period = '5y',
                  resolution = '1d',
-                 MAs = [5,20,60,200]):
+                 MAs = [5,20,60,200],
+                 index_df = None):
     """
     Compile all of the data
     we will use to train our model
+
+    index_df can be passed in to reuse index data that
+    has already been obtained with get_index_data
     """
-    main_df = pd.DataFrame() # our final dataframe
     count = 0 # keep track of progress
 
     # get extra financial information we want to use
     # in making predictions
-    index_df = get_index_data(indices,period,resolution,MAs)
+    if index_df is None:
+        index_df = get_index_data(indices,period,resolution,MAs)
 
     if resolution not in ['1d','1wk']:
        return "Please specify your resolution as '1d' or '1wk'"
 
-    for ticker in tickers:
-        try:
-            # yahoo finance doesn't like '.' full stops, and prefers '-' dashes
-            # for american equities
-            try:
-                if ticker.replace('.','').isalpha():
-                    ticker = ticker.replace('.', '-')
-            except:
-                pass
-
-            # read in a specific ticker's historical financial information
-            df = yf.Ticker(ticker).history(period = period,interval = resolution)
-            # drop columns we won't be using from that dataframe
-            df.drop(['Dividends','Stock Splits'],axis = 1,inplace = True)
-            
-            # make column names lower cased, because it's easier to type
-            for col in df.columns:
-                df.rename(columns = {col:col.lower()},inplace = True)
-      
-            # add a few rolling window columns on our closing price
-            df = create_close_MAs(df,MAs)
-
-            # scale data frame w/ percent change
-            # df = scale_df(df)
-            df = df.pct_change()
-            
-            # fill foward missing values just in case any came up
-            df.fillna(method = 'ffill')
-
-            df = remove_inf(df) # remove inf values 
-
-            # merge the extra financial info along the column-axis
-            df = pd.concat([df,index_df], axis=1, ignore_index=False)
-
-            # make our target variable
-            df = create_target(df)
-            
-            # remove NaNs
-            df.dropna(inplace = True,axis = 0)
-
-            # add this data to our final df
-            if main_df.empty:
-                main_df = df
-            else:
-                main_df = pd.concat([main_df,df],axis = 0)
-            
+    # read in every ticker's historical financial information at once
+    tickers = [yahoo_symbol(ticker) for ticker in tickers]
+    raw = download_data(tickers,period,resolution)
+
+    # pick out each ticker's historical financial information,
+    # skipping any that yahoo finance had nothing for
+    downloaded = set(raw.columns.get_level_values(0))
+    raws = [raw[ticker].dropna(how = 'all')
+            for ticker in tickers if ticker in downloaded]
+
+    # every ticker is processed independently, so spread them
+    # over one worker process per core; the index data is handed
+    # to each worker once when it starts rather than with every ticker
+    workers = os.cpu_count() or 1
+    chunksize = max(1,len(raws) // (4*workers))
+    with ProcessPoolExecutor(max_workers = workers,
+                             initializer = _init_worker,
+                             initargs = (index_df,)) as pool:
+        out = None # buffer holding every ticker's processed data
+        dates = [] # the dates of each ticker's rows
+        filled = 0 # number of rows written to the buffer so far
+        for df in pool.map(_process_ticker_worker,raws,repeat(MAs),
+                           chunksize = chunksize):
+            if df is None:
+                continue
+
+            if out is None:
+                # every ticker's frame has the same columns, and no more rows
+                # than were downloaded, so the buffer can be sized up front
+                cols, dtypes = df.columns, df.dtypes
+                out = np.empty((len(raws)*len(raw),len(cols)),dtype = np.float32)
+
+            # copy this data into its slice of the buffer
+            out[filled:filled+len(df)] = df[cols].to_numpy(dtype = np.float32)
+            filled += len(df)
+            dates.append(df.index)
+
             # progress counting
             count +=1 # increment for every stock addded
             if count % 50 == 0: # will let us know progress for every 50 stocks added
                 print(f'Progress: {count}/{len(tickers)}')
-        except:
-            continue
-    
+
+    # build our final dataframe from the filled part of the buffer,
+    # rather than concatenating every ticker's frame
+    if out is None:
+        main_df = pd.DataFrame()
+    else:
+        main_df = pd.DataFrame(out[:filled],index = dates[0].append(dates[1:]),
+                               columns = cols)
+        # restore any columns that aren't float32, e.g. our int8 target
+        main_df = main_df.astype({col:dtype for col,dtype in dtypes.items()
+                                  if dtype != np.float32})
+
     # get day of week; 0 = Monday, ..., so on so forth
     # if the data is daily; add it to dataframe as a column
+    # (fixing the categories means we always get the same dummy columns)
+    date_cols = []
     if resolution == '1d':
-      main_df['day'] = list(pd.Series(main_df.index).apply(lambda x: str(x.weekday())))
+      main_df['day'] = pd.Categorical(main_df.index.dayofweek,categories = range(5))
+      date_cols.append('day')
 
     # get month of year as a column
-    main_df['month'] = list(pd.Series(main_df.index).apply(lambda x: str(x.month)))
+    main_df['month'] = pd.Categorical(main_df.index.month,categories = range(1,13))
+    date_cols.append('month')
 
-    # convert categorical data to dummy variables
-    main_df = pd.get_dummies(main_df)
+    # convert categorical data to (compact) dummy variables
+    main_df = pd.get_dummies(main_df,columns = date_cols,dtype = np.int8)
 
     # drop any NaNs
     main_df = main_df.dropna(axis = 0)
@@ -260,7 +472,8 @@ def get_input_data(tickers,
                    indices = ["^GSPC","^VIX"],
                    period = '5y',
                    resolution = '1d',
-                   MAs = [5,20,60,200]):
+                   MAs = [5,20,60,200],
+                   index_df = None):
     """
     Gets the data we need for model training or testing;
     Ensures that the dataset has equal number of buy/sell signals
@@ -271,50 +484,50 @@ def get_input_data(tickers,
     represent the S&P500 index and VIX index on
     yahoo finance, respectively
     """
-    df = compile_data(tickers,indices,period,resolution,MAs)
+    df = compile_data(tickers,indices,period,resolution,MAs,index_df)
 
-    # obtain whichever is lower: the number of buy signals (1)
-    # or the number of sell signals (0)
-    lower = min(len(df.loc[df['target'] == 1]), len(df.loc[df['target'] == 0]))
+    # row positions of the buy signals (1) and sell signals (0)
+    target = df['target'].to_numpy()
+    buys = np.flatnonzero(target == 1)
+    sells = np.flatnonzero(target == 0)
 
-    # balance our data: 
-      # get dataframes of buys and sells which have the same number
-      # of buy and sell signals
-      # and combine them into a single dataframe
-    # i.e. downsample whichever has more obs
-    buys_df = df.loc[df['target'] == 1].sample(frac=lower/len(df.loc[df['target'] == 1]))
-    sells_df = df.loc[df['target'] == 0].sample(frac=lower/len(df.loc[df['target'] == 0]))
-    df_new = pd.concat([buys_df,sells_df],axis = 0)
+    # obtain whichever is lower: the number of buy signals
+    # or the number of sell signals
+    lower = min(len(buys),len(sells))
 
-    # shuffle the data
-    df_new = df_new.sample(frac = 1)
+    # balance our data:
+      # pick the same number of buy and sell signals
+      # i.e. downsample whichever has more obs
+    rng = np.random.default_rng()
+    rows = np.concatenate([rng.choice(buys,lower,replace = False),
+                           rng.choice(sells,lower,replace = False)])
+
+    # shuffle the data, and take all of the chosen rows in one go
+    rng.shuffle(rows)
+    df_new = df.iloc[rows]
 
     return df_new
 
 def get_preds_data(ticker,indices = ["^GSPC","^VIX"],
                    period = '3y',
                    resolution = '1d',
-                   MAs = [5,20,60,200]):
+                   MAs = [5,20,60,200],
+                   index_df = None):
     """
     Get data for model to make predictions on
+
+    index_df can be passed in to reuse index data when
+    getting prediction data for many tickers
     """
-    # yahoo finance doesn't like '.' full stops, and prefers '-' dashes
-    # for American equities
-    try:
-        if ticker.replace('.','').isalpha():
-            ticker = ticker.replace('.', '-')
-    except:
-        pass
-    
+    ticker = yahoo_symbol(ticker)
+
     # read in a specific ticker's historical financial information
-    df = yf.Ticker(ticker).history(period = period,interval = resolution)
-    index_df = get_index_data(indices,period,resolution,MAs)
+    df = download_data([ticker],period,resolution)[ticker]
+    if index_df is None:
+        index_df = get_index_data(indices,period,resolution,MAs)
 
     # drop columns we won't be using from that dataframe
-    try:
-        df.drop(['Dividends','Stock Splits'],axis = 1,inplace = True)
-    except:
-        pass
+    df = df.drop(['Dividends','Stock Splits'],axis = 1,errors = 'ignore')
 
     # make column names lower cased, because it's easier to type
     for col in df.columns:
@@ -329,9 +542,6 @@ def get_preds_data(ticker,indices = ["^GSPC","^VIX"],
     # normalise all columns as percentages
     df = df.pct_change()
 
-    # fill foward missing values just in case any came up
-    df.fillna(method = 'ffill')
-
     df = remove_inf(df) # remove inf values
 
     df = pd.concat([df,index_df], axis=1, ignore_index=False)
@@ -339,22 +549,17 @@ def get_preds_data(ticker,indices = ["^GSPC","^VIX"],
     # merge the extra financial info along the column-axis
     df = create_target(df)
 
-    # get day of week; 0 = Monday, ..., so on so forth
-    # as a column
+    # day of week (0 = Monday, ..., so on so forth) and month of year
+    # dummy columns. these have always been left at 0 here, and the
+    # model in model/model_week has only ever been given zeros for them,
+    # so keep it that way until the train and predict schemas are
+    # aligned and the model is retrained
+    date_cols = []
     if resolution == '1d':
-        day = list(pd.Series(df.index).apply(lambda x: int(x.weekday())))
-        for i in range(1,6):
-          df[f'day_{i}'] = np.where(day == i,1,0)
-
-    # get month of year as a list
-    month = list(pd.Series(df.index).apply(lambda x: int(x.month)))
-    
-    # convert month into dummies
-    for i in range(1,13):
-        df[f'month_{i}'] = np.where(month == i,1,0)
-
-    # convert categorical data to dummy variables
-    df = pd.get_dummies(df)
+        date_cols += [f'day_{i}' for i in range(5)] # same as compile_data
+    date_cols += [f'month_{i}' for i in range(1,13)]
+    df = pd.concat([df,pd.DataFrame(0,index = df.index,columns = date_cols,
+                                    dtype = np.int8)],axis = 1)
 
     df.dropna(inplace=True)
 
@@ -8,29 +8,40 @@ from plotly.subplots import make_subplots
 import plotly.express as px
 
 import yfinance as yf
-from ta.trend import MACD
+
+from get_data import moving_average
+
+def ema(series, window):
+    # exponential moving average, defined as in the ta library's MACD
+    return series.ewm(span=window, min_periods=window, adjust=False).mean()
+
+def get_rangebreaks(index):
+    # compare dates in the exchange's local time
+    index = pd.to_datetime(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    # weekends are always hidden, so only look for missing weekdays
+    # (holidays, or every other weekday for weekly data)
+    dt_weekdays = pd.bdate_range(start=index[0].normalize(),end=index[-1])
+    dt_breaks = dt_weekdays.difference(index.normalize())
+    return [dict(bounds=['sat', 'mon']),
+            dict(values=dt_breaks.strftime('%Y-%m-%d').tolist())]
 
 def plot_ticker(df, target):
-    dt_all = pd.date_range(start=df.index[0],end=df.index[-1])
-    # retrieve the dates that ARE in the original datset
-    dt_obs = [d.strftime("%Y-%m-%d") for d in pd.to_datetime(df.index)]
-    # define dates with missing values
-    dt_breaks = [d for d in dt_all.strftime("%Y-%m-%d").tolist() if not d in dt_obs]
+    # dates to hide from the x-axis
+    rangebreaks = get_rangebreaks(df.index)
 
     # add moving averages to df
-    df['MA20'] = df['Close'].rolling(window=20).mean()
-    df['MA5'] = df['Close'].rolling(window=5).mean()
-    df['MA5_pct'] = df['Close'].rolling(window=5).mean().pct_change()
-
-    # MACD
-    macd = MACD(close=df['Close'],
-                window_slow=26,
-                window_fast=12, 
-                window_sign=9)
+    close = df['Close'].to_numpy()
+    df['MA20'] = moving_average(close, 20)
+    df['MA5'] = moving_average(close, 5)
+    df['MA5_pct'] = df['MA5'].pct_change()
 
-    df['macd'] = macd.macd()
-    df['macd_diff'] = macd.macd_diff()
-    df['macd_signal'] = macd.macd_signal()
+    # MACD: fast EMA minus slow EMA of the close,
+    # with an EMA of that as the signal line
+    df['macd'] = ema(df['Close'], 12) - ema(df['Close'], 26)
+    df['macd_signal'] = ema(df['macd'], 9)
+    df['macd_diff'] = df['macd'] - df['macd_signal']
 
 
     fig = make_subplots(rows=3, cols=1, shared_xaxes=True,
@@ -58,15 +69,15 @@ def plot_ticker(df, target):
                             name='MA 20'))
 
     # Plot volume trace on 2nd row 
-    colors = ['green' if row['Close'] - row['Open'] >= 0 
-            else 'red' for index, row in df.iterrows()]
+    colors = np.where(df['Close'].to_numpy() >= df['Open'].to_numpy(),
+                      'green', 'red')
     fig.add_trace(go.Bar(x=df.index, 
                         y=df['Volume'],
                         marker_color=colors
                         ), row=2, col=1)
 
     # Plot MACD trace on 3rd row
-    colors = ['green' if val >= 0 else 'red' for val in df['macd_diff']]
+    colors = np.where(df['macd_diff'].to_numpy() >= 0, 'green', 'red')
     fig.add_trace(go.Bar(x=df.index, 
                         y=df['macd_diff'],
                         marker_color=colors,
@@ -87,7 +98,7 @@ def plot_ticker(df, target):
                       height=500, width=750, 
                       showlegend=False, 
                       xaxis_rangeslider_visible=False,
-                      xaxis_rangebreaks=[dict(values=dt_breaks)])
+                      xaxis_rangebreaks=rangebreaks)
 
     # update y-axis label
     fig.update_yaxes(title_text="Price", row=1, col=1)
@@ -108,11 +119,7 @@ def plot_returns(returns, predictions, target):
     df['returns_minus_strategy'] = df['strategy'] - df['returns']
     
     #datetime stuff
-    dt_all = pd.date_range(start=df.index[0],end=df.index[-1])
-    # retrieve the dates that ARE in the original datset
-    dt_obs = [d.strftime("%Y-%m-%d") for d in pd.to_datetime(df.index)]
-    # define dates with missing values
-    dt_breaks = [d for d in dt_all.strftime("%Y-%m-%d").tolist() if not d in dt_obs]
+    rangebreaks = get_rangebreaks(df.index)
 
     fig = make_subplots(rows=1, cols=1, shared_xaxes=True,
                     vertical_spacing=0.01)
@@ -131,7 +138,7 @@ def plot_returns(returns, predictions, target):
                     height=500, width=750, 
                     showlegend=False, 
                     xaxis_rangeslider_visible=False,
-                    xaxis_rangebreaks=[dict(values=dt_breaks)])
+                    xaxis_rangebreaks=rangebreaks)
 
     fig.update_yaxes(title_text="Returns", row=1, col=1)
     fig.update_yaxes(title_text="Difference", row=2, col=1)